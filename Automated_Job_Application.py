@@ -14,6 +14,30 @@ from bs4 import BeautifulSoup
 import requests
 import re
 import json
+import sys
+import threading
+import hashlib
+import functools
+import operator
+import smtplib
+import queue
+import logging
+from email.message import EmailMessage
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, fields
+
+# Optional resume parsers; TXT resumes work without them
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+try:
+    import docx
+except ImportError:
+    docx = None
+
+logger = logging.getLogger(__name__)
 
 # Set up the Streamlit page configuration
 st.set_page_config(
@@ -23,6 +47,57 @@ st.set_page_config(
     initial_sidebar_state = "expanded"
 )
 
+# Job ingest normalization
+JOB_TYPES = ["Full-time", "Part-time", "Contract", "Temporary", "Internship", "Remote"]
+
+LOCATION_CODES = {
+    "remote": "REMOTE", "anywhere": "REMOTE",
+    "california": "CA", "san francisco": "CA", "los angeles": "CA", "san jose": "CA", "san diego": "CA",
+    "new york": "NY", "new york city": "NY", "nyc": "NY", "washington": "WA", "seattle": "WA",
+    "texas": "TX", "austin": "TX", "dallas": "TX", "houston": "TX", "connecticut": "CT",
+    "massachusetts": "MA", "boston": "MA", "georgia": "GA", "atlanta": "GA", "florida": "FL", "miami": "FL",
+    "oregon": "OR", "portland": "OR", "colorado": "CO", "denver": "CO", "illinois": "IL", "chicago": "IL",
+    "arizona": "AZ", "phoenix": "AZ", "missouri": "MO", "new jersey": "NJ", "north carolina": "NC", "raleigh": "NC"
+}
+
+SALARY_PATTERN = re.compile(r'(\$)?\s*(\d+(?:,\d{3})*(?:\.\d+)?)\s*([kK])?')
+SALARY_RANGE_PATTERN = re.compile(r'\d\s*[kK]?\s*(?:-|–|to)\s*\$?\s*\d')
+
+def parse_salary(salary):
+    """Parse a salary string like "$120K - $150K" into a (min, max) range in $K
+
+    Only amounts marked with $ or written as a range count, so "Competitive, 401k" has no salary.
+    """
+    salary = salary or ""
+    is_range = SALARY_RANGE_PATTERN.search(salary) is not None
+
+    amounts = []
+    for dollar, amount, thousands in SALARY_PATTERN.findall(salary):
+        if not (dollar or is_range):
+            continue
+        value = float(amount.replace(",", ""))
+        amounts.append(value if thousands or value < 1000 else value / 1000)
+
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
+
+def normalize_location(location):
+    """Normalize a location such as "Boston, MA" or "New York" to a state code or REMOTE"""
+    location = (location or "").strip()
+    if not location:
+        return None
+
+    if location.lower() in LOCATION_CODES:
+        return LOCATION_CODES[location.lower()]
+
+    # Otherwise a trailing two-letter state code wins, in any case, e.g. "Austin, TX" or "new york, ny"
+    state_match = re.search(r'(?:^|[\s,])([A-Za-z]{2})$', location)
+    if state_match:
+        return state_match.group(1).upper()
+
+    return location.upper()
+
 # Database setup
 def init_db():
     conn = sqlite3.connect('job_applications.db')
@@ -40,7 +115,14 @@ def init_db():
         date_applied TEXT,
         status TEXT,
         matching_score REAL,
-        notes TEXT
+        notes TEXT,
+        profile_id INTEGER,
+        message TEXT,
+        salary_min REAL,
+        salary_max REAL,
+        location_code TEXT,
+        job_type TEXT,
+        score_version INTEGER
     )          
     ''')
 
@@ -54,7 +136,96 @@ def init_db():
         skills TEXT,
         experience TEXT,
         education TEXT,
-        preference TEXT
+        preference TEXT,
+        version INTEGER DEFAULT 1,
+        resume_hash TEXT
+    )
+    ''')
+
+    # Every save bumps the profile version so scores computed against older versions can be found;
+    # resume_hash records the resume contents that version was scored with
+    c.execute('PRAGMA table_info(user_profile)')
+    profile_columns = [row[1] for row in c.fetchall()]
+    if "version" not in profile_columns:
+        c.execute('ALTER TABLE user_profile ADD COLUMN version INTEGER DEFAULT 1')
+    if "resume_hash" not in profile_columns:
+        c.execute('ALTER TABLE user_profile ADD COLUMN resume_hash TEXT')
+
+    # Databases created before multi-profile support have no owner on jobs; hand them to the latest profile
+    c.execute('PRAGMA table_info(jobs)')
+    job_columns = [row[1] for row in c.fetchall()]
+    if "profile_id" not in job_columns:
+        c.execute('ALTER TABLE jobs ADD COLUMN profile_id INTEGER')
+        c.execute('UPDATE jobs SET profile_id = (SELECT MAX(id) FROM user_profile)')
+    for column, column_type in [("message", "TEXT"), ("salary_min", "REAL"), ("salary_max", "REAL"),
+                                ("location_code", "TEXT"), ("job_type", "TEXT"), ("score_version", "INTEGER")]:
+        if column not in job_columns:
+            c.execute(f'ALTER TABLE jobs ADD COLUMN {column} {column_type}')
+
+    # Backfill the parsed salary and location columns for rows stored before they existed
+    if "salary_min" not in job_columns:
+        c.execute('SELECT id, salary, location FROM jobs')
+        for job_id, salary, location in c.fetchall():
+            salary_min, salary_max = parse_salary(salary)
+            c.execute('UPDATE jobs SET salary_min = ?, salary_max = ?, location_code = ? WHERE id = ?',
+                      (salary_min, salary_max, normalize_location(location), job_id))
+
+    # Every per-user query leads with profile_id so lookups stay indexed regardless of how many users share the DB
+    c.execute('CREATE INDEX IF NOT EXISTS idx_jobs_profile_date ON jobs (profile_id, date_applied)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_jobs_profile_status ON jobs (profile_id, status)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_jobs_profile_url ON jobs (profile_id, job_url)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_jobs_profile_score_version ON jobs (profile_id, score_version)')
+
+    # Parsed resumes, keyed by content hash so identical contents are only parsed once
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS resume_cache (
+        file_hash TEXT PRIMARY KEY,
+        skills TEXT,
+        years_experience INTEGER,
+        education TEXT,
+        parse_seconds REAL
+    )
+    ''')
+
+    # The contents last seen at each resume path, so an unchanged file is not even rehashed
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS resume_files (
+        resume_path TEXT PRIMARY KEY,
+        mtime REAL,
+        file_hash TEXT
+    )
+    ''')
+
+    # Notification events waiting to be sent as digests
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY,
+        profile_id INTEGER,
+        event_type TEXT,
+        message TEXT,
+        created_at TEXT,
+        status TEXT DEFAULT 'pending',
+        sent_at TEXT
+    )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, profile_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_outbox_profile_sent ON outbox (profile_id, status, sent_at)')
+
+    # Descriptions of recent search results, so results stay viewable after the in-memory cache evicts them
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS job_descriptions (
+        job_url TEXT PRIMARY KEY,
+        job_description TEXT,
+        cached_at TEXT
+    )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_job_descriptions_cached_at ON job_descriptions (cached_at)')
+
+    # Application settings, one JSON document per profile
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS settings (
+        profile_id INTEGER PRIMARY KEY,
+        data TEXT
     )
     ''')
 
@@ -131,6 +302,9 @@ st.sidebar.markdown("# 💼 Job Application Agent")
 page = st.sidebar.radio("Navigation", ["Dashboard", "Job Search", "Profile Setup", "Application Settings", "Job Tracker", "Analytics"])
 
 # Helper functions for job search and application
+# Scale for the simulated scraping and applying delays; the load test sets it to 0 to measure the app itself
+SIMULATED_DELAY_SCALE = float(os.environ.get("SIMULATED_DELAY_SCALE", 1))
+
 def scrape_jobs(keywords, location, platforms, num_results = 20):
     """Simulate scraping jobs from various platforms"""
     all_jobs = []
@@ -147,7 +321,7 @@ def scrape_jobs(keywords, location, platforms, num_results = 20):
     ] 
 
     locations = [
-        "CA", "NY", "WA", "TX", "CT", "MA", "GA", "FL", "OR", "CO", "IL", "AZ", "MO", "NJ", "NC"
+        "CA", "NY", "WA", "TX", "CT", "MA", "GA", "FL", "OR", "CO", "IL", "AZ", "MO", "NJ", "NC", "Remote"
     ]
 
     # For each selected platform, generate simulated job listings
@@ -179,7 +353,7 @@ def scrape_jobs(keywords, location, platforms, num_results = 20):
                 "Python", "JavaScript", "SQL", "React", "Node.js", "AWS", "Docker", "Kubernetes", "TensorFlow",
                 "PyTorch", "Excel", "Tableau", "PowerBI", "Figma", "Sketch", "JIRA", "Git", "SnowFlake", "Artificial Intelligence",
                 "Machine Learning", "Deep Learning", "NLP"
-            ], k = random.randit(3, 7))
+            ], k = random.randint(3, 7))
 
             experience = f"{random.randint(1, 8)}+ years"
 
@@ -205,6 +379,9 @@ def scrape_jobs(keywords, location, platforms, num_results = 20):
 
             job_url = f"https://{platform.lower().replace(' ', '')}.com/jobs/{company.lower()}-{job_title.lower().replace(' ','-')}-{random.randint(10000, 99999)}"
 
+            # Parse salary and location into filterable columns at ingest
+            salary_min, salary_max = parse_salary(salary)
+
             job = {
                 "job_title": job_title,
                 "company": company,
@@ -213,7 +390,11 @@ def scrape_jobs(keywords, location, platforms, num_results = 20):
                 "salary": salary,
                 "job_url": job_url,
                 "platform": platform,
-                "date_posted": (datetime.now().date() - pd.Timedelta(days=random.randint(0, 14))).strftime("%Y-%m-%d")
+                "date_posted": (datetime.now().date() - pd.Timedelta(days=random.randint(0, 14))).strftime("%Y-%m-%d"),
+                "job_type": random.choice(JOB_TYPES),
+                "salary_min": salary_min,
+                "salary_max": salary_max,
+                "location_code": normalize_location(job_location)
             }
 
             platform_jobs.append(job)
@@ -226,14 +407,26 @@ def scrape_jobs(keywords, location, platforms, num_results = 20):
     # Return the specified number of results
     return all_jobs[:num_results]
 
+def find_matched_skills(job_desc, user_skills):
+    """Get the user's skills that appear in a job description, most mentioned first"""
+    job_desc_lower = job_desc.lower()
+
+    if isinstance(user_skills, str):
+        user_skills = user_skills.split(',')
+    mentions = [(job_desc_lower.count(skill.strip().lower()), skill.strip()) for skill in user_skills if skill.strip()]
+
+    return [skill for count, skill in sorted(mentions, key = lambda mention: -mention[0]) if count]
+
 def calculate_matching_score(job_desc, user_skills, user_experience):
     """Calculate a matching score between job and user profile"""
     
     # Convert inputs to lowercase for case-insensitive matching
-    job_desc_lower = job_desc_lower()
+    job_desc_lower = job_desc.lower()
 
-    # Extract user skills and convert to lowercase
-    user_skills_list = [skill.strip().lower() for skill in user_skills.split(',')]
+    # Extract user skills (a comma separated string or a list) and convert to lowercase
+    if isinstance(user_skills, str):
+        user_skills = user_skills.split(',')
+    user_skills_list = [skill.strip().lower() for skill in user_skills if skill.strip()]
 
     # Count how many user skills appear in the job description
     matched_skills = sum(1 for skill in user_skills_list if skill in job_desc_lower)
@@ -262,8 +455,296 @@ def calculate_matching_score(job_desc, user_skills, user_experience):
     # Scale to 0-100%
     return round(matching_score * 100, 1)
 
-def apply_to_job(job, user_profile):
-    """Simulate applying to a job"""
+# Resume parsing
+KNOWN_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Rust", "Ruby", "PHP", "Scala", "SQL",
+    "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "React", "Angular", "Vue", "Node.js", "Django", "Flask",
+    "HTML", "CSS", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Linux", "Git", "JIRA",
+    "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Spark", "Hadoop", "Airflow", "Snowflake", "Excel",
+    "Tableau", "PowerBI", "Figma", "Sketch", "Artificial Intelligence", "Machine Learning", "Deep Learning", "NLP",
+    "Computer Vision", "Data Analysis", "Statistics", "Agile", "Scrum", "Project Management", "Product Management",
+    "Marketing", "Sales", "Communication", "Leadership"
+]
+
+# One precompiled alternation scans a resume once instead of once per skill; longer names are tried first
+SKILL_PATTERN = re.compile(
+    r'(?<![\w+#.])(' + '|'.join(re.escape(skill) for skill in sorted(KNOWN_SKILLS, key = len, reverse = True)) + r')(?![\w+#])',
+    re.IGNORECASE
+)
+SKILL_NAMES = {skill.lower(): skill for skill in KNOWN_SKILLS}
+YEARS_PATTERN = re.compile(r'(\d+)\+?\s*(?:years|yrs)', re.IGNORECASE)
+DATE_RANGE_PATTERN = re.compile(r'\b((?:19|20)\d{2})\s*(?:-|–|to)\s*((?:19|20)\d{2}|present|current)\b', re.IGNORECASE)
+EDUCATION_PATTERN = re.compile(r'\b(?:bachelor|master|ph\.?d|doctorate|mba|associate degree|diploma|b\.sc?|m\.sc?|b\.a|m\.a)\b', re.IGNORECASE)
+
+def extract_resume_text(resume_path):
+    """Extract plain text from a PDF, DOCX or TXT resume
+
+    Raises ValueError for unsupported, corrupt or unreadable files.
+    """
+    extension = os.path.splitext(resume_path)[1].lower()
+
+    # The parsers raise their own exception types for corrupt or misnamed files; report them all the same way
+    try:
+        if extension == ".pdf":
+            if PdfReader is None:
+                raise ImportError("pypdf is required to parse PDF resumes")
+            reader = PdfReader(resume_path)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+        elif extension == ".docx":
+            if docx is None:
+                raise ImportError("python-docx is required to parse DOCX resumes")
+            document = docx.Document(resume_path)
+            return "\n".join(paragraph.text for paragraph in document.paragraphs)
+        elif extension == ".txt":
+            with open(resume_path, encoding = "utf-8", errors = "ignore") as f:
+                return f.read()
+    except Exception as e:
+        raise ValueError(f"Could not read resume {os.path.basename(resume_path)}: {e}") from e
+
+    raise ValueError(f"Unsupported resume format: {extension or resume_path}")
+
+def parse_resume(resume_path):
+    """Extract skills, years of experience and education from a resume"""
+    text = extract_resume_text(resume_path)
+
+    skills = list(dict.fromkeys(SKILL_NAMES[match.lower()] for match in SKILL_PATTERN.findall(text)))
+
+    # Prefer an explicit "N years" statement, otherwise span the employment date ranges
+    years_experience = max((int(years) for years in YEARS_PATTERN.findall(text)), default = 0)
+    if not years_experience:
+        current_year = datetime.now().year
+        ranges = [(int(start), int(end) if end.isdigit() else current_year) for start, end in DATE_RANGE_PATTERN.findall(text)]
+        if ranges:
+            years_experience = max(end for _, end in ranges) - min(start for start, _ in ranges)
+
+    education_lines = [line.strip() for line in text.splitlines() if EDUCATION_PATTERN.search(line)]
+    education = "\n".join(list(dict.fromkeys(education_lines))[:5])
+
+    return {
+        "skills": skills,
+        "years_experience": min(years_experience, 50),
+        "education": education
+    }
+
+def get_file_hash(path):
+    """Get the SHA-256 hash of a file's contents"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def get_resume_data(resume_path):
+    """Get parsed resume fields, parsing only when the file is new or its contents changed"""
+    if not resume_path or not os.path.isfile(resume_path):
+        return None
+
+    mtime = os.path.getmtime(resume_path)
+
+    conn = sqlite3.connect('job_applications.db')
+    conn.row_factory = sqlite3.Row
+    c = conn.cursor()
+
+    # An unchanged path and mtime skips hashing entirely
+    c.execute('SELECT mtime, file_hash FROM resume_files WHERE resume_path = ?', (resume_path,))
+    previous = c.fetchone()
+
+    if previous and previous["mtime"] == mtime:
+        file_hash = previous["file_hash"]
+    else:
+        file_hash = get_file_hash(resume_path)
+        c.execute('INSERT OR REPLACE INTO resume_files (resume_path, mtime, file_hash) VALUES (?, ?, ?)',
+                  (resume_path, mtime, file_hash))
+
+    c.execute('SELECT * FROM resume_cache WHERE file_hash = ?', (file_hash,))
+    result = c.fetchone()
+
+    if not result:
+        start = time.perf_counter()
+        parsed = parse_resume(resume_path)
+        parse_seconds = time.perf_counter() - start
+
+        # Another session may have parsed the same new file meanwhile; the results are identical
+        c.execute('''
+        INSERT OR REPLACE INTO resume_cache (file_hash, skills, years_experience, education, parse_seconds)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (file_hash, json.dumps(parsed["skills"]), parsed["years_experience"], parsed["education"], parse_seconds))
+        c.execute('SELECT * FROM resume_cache WHERE file_hash = ?', (file_hash,))
+        result = c.fetchone()
+
+    conn.commit()
+    conn.close()
+
+    resume_data = dict(result)
+    resume_data["skills"] = json.loads(resume_data["skills"])
+    return resume_data
+
+def get_matching_profile(user_profile):
+    """Combine typed profile fields with the parsed resume into the matcher's skills and experience"""
+    skills = [skill.strip() for skill in (user_profile["skills"] or "").split(",") if skill.strip()]
+    experience = user_profile["experience"] or ""
+
+    try:
+        resume_data = get_resume_data(user_profile["resume_path"])
+    except (ValueError, OSError):
+        resume_data = None
+
+    if resume_data:
+        known_skills = {skill.lower() for skill in skills}
+        skills += [skill for skill in resume_data["skills"] if skill.lower() not in known_skills]
+
+        if resume_data["years_experience"] and not YEARS_PATTERN.search(experience):
+            experience = f"{resume_data['years_experience']} years. {experience}"
+
+    return skills, experience
+
+def score_jobs(job_descs, user_profile):
+    """Score a batch of job descriptions, resolving the profile's skills and experience once"""
+    skills, experience = get_matching_profile(user_profile)
+    return [calculate_matching_score(job_desc, skills, experience) for job_desc in job_descs]
+
+# Application message templates
+DEFAULT_MESSAGE_TEMPLATE = "Dear Hiring Manager, \n\nI am writing to express my interest in the [JOB_TITLE] position at [COMPANY]. With my experience in [SKILLS], I believe I would be a great fit for this role. \n\nThank you for your consideration. \n\nBest regards, \n[FULL_NAME]"
+TEMPLATE_PLACEHOLDERS = ["[JOB_TITLE]", "[COMPANY]", "[SKILLS]", "[FULL_NAME]"]
+PLACEHOLDER_PATTERN = re.compile("|".join(re.escape(placeholder) for placeholder in TEMPLATE_PLACEHOLDERS))
+
+@functools.lru_cache(maxsize = 32)
+def compile_template(template):
+    """Compile a message template into a function of (job_title, company, skills, full_name)"""
+    # Placeholders become %s slots with a precomputed pick order, so a render is one tuple pick and one % format
+    format_string = PLACEHOLDER_PATTERN.sub("%s", template.replace("%", "%%"))
+    order = [TEMPLATE_PLACEHOLDERS.index(placeholder) for placeholder in PLACEHOLDER_PATTERN.findall(template)]
+
+    if len(order) == 1:
+        return lambda *values: format_string % (values[order[0]],)
+    pick = operator.itemgetter(*order) if order else lambda values: ()
+    return lambda *values: format_string % pick(values)
+
+def render_messages(template, jobs, user_profile, max_skills = 3):
+    """Render the application message for every job in a batch, highlighting each job's best matching skills"""
+    render = compile_template(template)
+    skills, _ = get_matching_profile(user_profile)
+    default_skills = ", ".join(skills[:max_skills])
+    full_name = user_profile["full_name"] or ""
+
+    messages = []
+    for job in jobs:
+        matched_skills = find_matched_skills(job["job_description"], skills)[:max_skills]
+        messages.append(render(
+            job["job_title"],
+            job["company"],
+            ", ".join(matched_skills) if matched_skills else default_skills,
+            full_name
+        ))
+
+    return messages
+
+# Application settings
+SETTINGS_TTL_SECONDS = 30
+JOB_PLATFORMS = ["LinkedIn", "Indeed", "Glassdoor", "Welcome to the Jungle", "Handshake", "Built In", "Google Jobs", "ZipRecruiter", "Monster"]
+
+@dataclass(frozen = True)
+class AppSettings:
+    """Application settings for a profile; frozen since one instance is shared by every session in the process"""
+    enable_auto_apply: bool = True
+    max_applications: int = 10
+    min_match_score: int = 75
+    preferred_platforms: tuple = ("LinkedIn", "Indeed", "Glassdoor")
+    message_template: str = DEFAULT_MESSAGE_TEMPLATE
+    job_types: tuple = ("Full-time", "Remote")
+    min_salary: int = 50
+    max_salary: int = 200
+    industries: tuple = ("Technology", "Finance", "Consulting")
+    locations: str = "Remote, New York, San Francisco, Boston"
+    email_notifications: bool = True
+    notification_email: str = ""
+    notification_types: tuple = ("Successful applications", "Interview invitations", "Job offers")
+    notification_frequency: str = "Daily"
+
+def settings_from_json(data):
+    """Build settings from a stored JSON document, ignoring keys from older versions and defaulting new ones"""
+    stored = json.loads(data) if data else {}
+    values = {}
+    for field in fields(AppSettings):
+        if field.name in stored:
+            value = stored[field.name]
+            values[field.name] = tuple(value) if isinstance(value, list) else value
+
+    return AppSettings(**values)
+
+@st.cache_resource(ttl = SETTINGS_TTL_SECONDS, max_entries = 1000)
+def load_settings(profile_id):
+    """Load a profile's settings, cached per process
+
+    save_settings clears the cache in its own process; other processes pick up saves once the TTL expires.
+    """
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+
+    c.execute('SELECT data FROM settings WHERE profile_id = ?', (profile_id,))
+    result = c.fetchone()
+
+    conn.close()
+    return settings_from_json(result[0] if result else None)
+
+def save_settings(profile_id, **changes):
+    """Save changes to a profile's settings and return the updated settings
+
+    Changes are merged onto the stored document inside one write transaction, so concurrent saves
+    of other settings from other sessions or processes are kept.
+    """
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+
+    c.execute('BEGIN IMMEDIATE')
+    c.execute('SELECT data FROM settings WHERE profile_id = ?', (profile_id,))
+    result = c.fetchone()
+
+    data = json.loads(result[0]) if result and result[0] else {}
+    data.update({name: list(value) if isinstance(value, tuple) else value for name, value in changes.items()})
+    settings = settings_from_json(json.dumps(data))
+
+    c.execute('INSERT OR REPLACE INTO settings (profile_id, data) VALUES (?, ?)',
+              (profile_id, json.dumps(asdict(settings))))
+
+    conn.commit()
+    conn.close()
+
+    load_settings.clear()
+    return settings
+
+def filter_jobs(jobs, settings, location = None):
+    """Drop jobs outside the salary, location and job type preferences before they are scored
+
+    A location entered for the search takes the place of the preferred locations.
+
+    Returns the remaining jobs and the number of jobs left after each stage.
+    """
+    stages = [("Scraped", len(jobs))]
+    if not jobs:
+        return jobs, stages
+
+    # Cheap vectorized masks over the parsed columns; jobs without a parsed salary or location are kept
+    jobs_df = pd.DataFrame(jobs, columns = ["salary_min", "salary_max", "location_code", "job_type"])
+    keep = ~(jobs_df["salary_max"] < settings.min_salary) & ~(jobs_df["salary_min"] > settings.max_salary)
+    stages.append(("Salary", int(keep.sum())))
+
+    if location and location.strip():
+        location_codes = {normalize_location(location)}
+    else:
+        location_codes = {normalize_location(preferred) for preferred in settings.locations.split(",") if preferred.strip()}
+    if location_codes:
+        keep &= jobs_df["location_code"].isin(location_codes) | jobs_df["location_code"].isna()
+    stages.append(("Location", int(keep.sum())))
+
+    if settings.job_types:
+        keep &= jobs_df["job_type"].isin(settings.job_types) | jobs_df["job_type"].isna()
+    stages.append(("Job type", int(keep.sum())))
+
+    return [job for job, passed in zip(jobs, keep) if passed], stages
+
+def apply_to_job(job, user_profile, message = None):
+    """Simulate applying to a job, storing the message sent with the application"""
 
     success = random.random() < 0.9
 
@@ -271,34 +752,47 @@ def apply_to_job(job, user_profile):
         conn = sqlite3.connect('job_applications.db')
         c = conn.cursor()
 
-        matching_score = calculate_matching_score(
-            job["job_description"],
-            user_profile["skilles"],
-            user_profile["experience"]
-        )
+        matching_score = score_jobs([job["job_description"]], user_profile)[0]
 
         c.execute('''
-        INSERT INTO JOBS (job_title, company, location, job_description, salary,
-                  job_url, platform, date_applied, status, matching_score, notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO jobs (job_title, company, location, job_description, salary,
+                  job_url, platform, date_applied, status, matching_score, notes, profile_id, message,
+                  salary_min, salary_max, location_code, job_type, score_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             job["job_title"], job["company"], job["location"], job["job_description"],
-            job["salary"], job["job_url"], job["platform"], datetime.now().strftime(%Y-%m-%d),
-            "Applied", matching_score, "Auto-applied bu job Application Agent"
+            job["salary"], job["job_url"], job["platform"], datetime.now().strftime("%Y-%m-%d"),
+            "Applied", matching_score, "Auto-applied by Job Application Agent", user_profile["id"], message,
+            job.get("salary_min"), job.get("salary_max"), job.get("location_code"), job.get("job_type"),
+            user_profile["version"]
         ))
+        enqueue_notification(c, user_profile["id"], "Successful applications",
+                             f"Applied to {job['job_title']} at {job['company']} via {job['platform']}")
 
-        conn.connect()
+        conn.commit()
         conn.close()
 
     return success
 
-def get_user_profile():
-    """Get user profile from database"""
+def list_user_profiles():
+    """Get the id and name of every profile, newest first"""
     conn = sqlite3.connect('job_applications.db')
     conn.row_factory = sqlite3.Row
     c = conn.cursor()
 
-    c.execute('SELECT * FROM user_profile ORDER By id DESC LIMIT 1')
+    c.execute('SELECT id, full_name FROM user_profile ORDER BY id DESC')
+    results = [dict(row) for row in c.fetchall()]
+
+    conn.close()
+    return results
+
+def get_user_profile(profile_id):
+    """Get a user profile from database"""
+    conn = sqlite3.connect('job_applications.db')
+    conn.row_factory = sqlite3.Row
+    c = conn.cursor()
+
+    c.execute('SELECT * FROM user_profile WHERE id = ?', (profile_id,))
     result = c.fetchone()
 
     conn.close()
@@ -308,52 +802,497 @@ def get_user_profile():
     else:
         return None
     
-def save_user_profile(profile_data):
-    """Save user profile to database"""
+def save_user_profile(profile_data, profile_id = None):
+    """Save user profile to database, creating a new profile when no id is given"""
     conn = sqlite3.connect('job_applications.db')
     c = conn.cursor()
 
-    c.execute('''
-    INSERT INTO user_profile (full_name, email, phone, resume_path, skills, experience, education, preference)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+    values = (
         profile_data["full_name"], profile_data["email"], profile_data["phone"],
         profile_data["resume_path"], profile_data["skills"], profile_data["experience"],
-        profile_data["education"], profile_data["performance"]
-    ))
+        profile_data["education"], profile_data["preferences"], profile_data.get("resume_hash")
+    )
+
+    if profile_id:
+        c.execute('''
+        UPDATE user_profile SET full_name = ?, email = ?, phone = ?, resume_path = ?, skills = ?,
+                  experience = ?, education = ?, preference = ?, resume_hash = ?, version = version + 1
+        WHERE id = ?
+        ''', values + (profile_id,))
+    else:
+        c.execute('''
+        INSERT INTO user_profile (full_name, email, phone, resume_path, skills, experience, education, preference, resume_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', values)
+        profile_id = c.lastrowid
 
     conn.commit()
     conn.close()
+    return profile_id
 
-def get_applied_jobs():
-    """Get list of jobs the user has applied to"""
+def get_applied_jobs(profile_id, since = None):
+    """Get list of jobs the user has applied to, optionally only those applied on or after a date"""
     conn = sqlite3.connect('job_applications.db')
     conn.row_factory = sqlite3.Row
     c = conn.cursor()
 
-    c.execute('SELECT * FROM jobs ORDER BY date_applied DESC')
+    if since:
+        c.execute('SELECT * FROM jobs WHERE profile_id = ? AND date_applied >= ? ORDER BY date_applied DESC',
+                  (profile_id, since))
+    else:
+        c.execute('SELECT * FROM jobs WHERE profile_id = ? ORDER BY date_applied DESC', (profile_id,))
     results = [dict(row) for row in c.fetchall()]
 
     conn.close()
     return results
 
-def update_job_status(job_id, new_status, notes = None):
-    """Update the status of a job application"""
+def get_status_counts(profile_id):
+    """Count the user's applications by status"""
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+
+    c.execute('SELECT status, COUNT(*) FROM jobs WHERE profile_id = ? GROUP BY status', (profile_id,))
+    results = dict(c.fetchall())
+
+    conn.close()
+    return results
+
+def has_applied(profile_id, job_url):
+    """Check whether the user has already applied to a job"""
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+
+    c.execute('SELECT 1 FROM jobs WHERE profile_id = ? AND job_url = ? LIMIT 1', (profile_id, job_url))
+    result = c.fetchone()
+
+    conn.close()
+    return result is not None
+
+def update_job_status(profile_id, job_id, new_status, notes = None):
+    """Update the status of one of the user's job applications"""
     conn = sqlite3.connect('job_applications.db')
     c = conn.cursor()
 
     if notes:
-        c.execute('UPDATE jobs SET status = ?, notes = ? WHERE id = ?',
-                  (new_status, notes, job_id))
+        c.execute('UPDATE jobs SET status = ?, notes = ? WHERE id = ? AND profile_id = ?',
+                  (new_status, notes, job_id, profile_id))
     else:
-        c.execute('SELECT notes FROM jobs WHERE id = ?', (job_id))
-        current_notes = c.fetchone()[0]
-        c.execute('UPDATE jobs SET STATUS = ?', notes = ? WHERE id = ?',
-                  (new_status, current_notes, job_id))
+        c.execute('UPDATE jobs SET status = ? WHERE id = ? AND profile_id = ?',
+                  (new_status, job_id, profile_id))
+
+    c.execute('SELECT job_title, company FROM jobs WHERE id = ? AND profile_id = ?', (job_id, profile_id))
+    result = c.fetchone()
+    if result:
+        enqueue_notification(c, profile_id, STATUS_NOTIFICATION_TYPES.get(new_status, "Application status changes"),
+                             f"{result[0]} at {result[1]} is now {new_status}")
         
     conn.commit()
     conn.close()
 
+# Notifications
+STATUS_NOTIFICATION_TYPES = {"Interview": "Interview invitations", "Offer": "Job offers"}
+NOTIFICATION_INTERVALS = {"Immediately": 0, "Hourly": 3600, "Daily": 86400, "Weekly": 604800}
+NOTIFICATION_POLL_SECONDS = 60
+OUTBOX_RETENTION_DAYS = 30
+
+def enqueue_notification(c, profile_id, event_type, message):
+    """Append a notification event to the outbox on the caller's cursor, so it commits with the change it describes"""
+    # Without an SMTP server nothing would ever send the event
+    if not os.environ.get("SMTP_HOST"):
+        return
+
+    c.execute('INSERT INTO outbox (profile_id, event_type, message, created_at) VALUES (?, ?, ?, ?)',
+              (profile_id, event_type, message, datetime.now().isoformat(timespec = "seconds")))
+
+class NotificationDispatcher:
+    """Sends pending outbox events as one digest per profile over a single reused SMTP connection"""
+
+    def __init__(self, host, port = 25, username = None, password = None, sender = "job-agent@localhost", use_tls = False):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.use_tls = use_tls
+        self._smtp = None
+
+    def _connection(self):
+        # Reuse the open connection while the server still answers, otherwise reconnect
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        self._smtp = smtplib.SMTP(self.host, self.port, timeout = 30)
+        if self.use_tls:
+            self._smtp.starttls()
+        if self.username:
+            self._smtp.login(self.username, self.password)
+        return self._smtp
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def dispatch(self, now = None):
+        """Send a digest to every profile whose notification frequency is due and return how many were sent"""
+        now = now or datetime.now()
+        sent = 0
+
+        conn = sqlite3.connect('job_applications.db')
+        c = conn.cursor()
+
+        c.execute("SELECT DISTINCT profile_id FROM outbox WHERE status = 'pending'")
+        for (profile_id,) in c.fetchall():
+            settings = load_settings(profile_id)
+
+            c.execute("SELECT MAX(sent_at) FROM outbox WHERE profile_id = ? AND status = 'sent'", (profile_id,))
+            last_sent = c.fetchone()[0]
+            if last_sent and (now - datetime.fromisoformat(last_sent)).total_seconds() < NOTIFICATION_INTERVALS[settings.notification_frequency]:
+                continue
+
+            c.execute("SELECT id, event_type, message FROM outbox WHERE profile_id = ? AND status = 'pending' ORDER BY id",
+                      (profile_id,))
+            events = c.fetchall()
+
+            # Events the user has not opted into are closed out without being sent
+            wanted = [event for event in events if event[1] in settings.notification_types]
+            if not (settings.email_notifications and settings.notification_email):
+                wanted = []
+
+            wanted_status = "sent"
+            if wanted:
+                try:
+                    self._connection().send_message(self.build_digest(settings.notification_email, wanted))
+                    sent += 1
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError):
+                    # The server rejected this digest, e.g. a bad address; close it out so other profiles still get theirs.
+                    # Connection-level errors propagate and leave everything pending for the next poll
+                    logger.exception("Notification digest for profile %s was rejected", profile_id)
+                    wanted_status = "failed"
+
+            wanted_ids = {event[0] for event in wanted}
+            c.executemany('UPDATE outbox SET status = ?, sent_at = ? WHERE id = ?', [
+                (wanted_status if event[0] in wanted_ids else "skipped", now.isoformat(timespec = "seconds"), event[0])
+                for event in events
+            ])
+            conn.commit()
+
+        # Handled events are only needed to pace digests; keep them long enough to cover the weekly interval
+        c.execute("DELETE FROM outbox WHERE status != 'pending' AND sent_at < ?",
+                  ((now - pd.Timedelta(days = OUTBOX_RETENTION_DAYS)).isoformat(timespec = "seconds"),))
+        conn.commit()
+
+        conn.close()
+        return sent
+
+    def build_digest(self, recipient, events):
+        """Build one email coalescing a profile's events, grouped by type"""
+        sections = {}
+        for _, event_type, message in events:
+            sections.setdefault(event_type, []).append(f"- {message}")
+
+        digest = EmailMessage()
+        digest["From"] = self.sender
+        digest["To"] = recipient
+        digest["Subject"] = f"Job Application Agent: {len(events)} update{'s' if len(events) != 1 else ''}"
+        digest.set_content("\n\n".join(f"{event_type}\n" + "\n".join(lines) for event_type, lines in sections.items()))
+        return digest
+
+@st.cache_resource
+def start_notification_dispatcher():
+    """Start one background dispatcher per process when SMTP_HOST is configured"""
+    if not os.environ.get("SMTP_HOST"):
+        return None
+
+    dispatcher = NotificationDispatcher(
+        os.environ["SMTP_HOST"],
+        int(os.environ.get("SMTP_PORT", 25)),
+        os.environ.get("SMTP_USERNAME"),
+        os.environ.get("SMTP_PASSWORD"),
+        os.environ.get("SMTP_SENDER", "job-agent@localhost"),
+        os.environ.get("SMTP_USE_TLS", "").lower() in ("1", "true", "yes")
+    )
+
+    def run():
+        while True:
+            try:
+                dispatcher.dispatch()
+            except (smtplib.SMTPException, OSError, sqlite3.Error):
+                # Leave events pending and retry with a fresh connection on the next poll
+                dispatcher.close()
+            time.sleep(NOTIFICATION_POLL_SECONDS)
+
+    threading.Thread(target = run, name = "notification-dispatcher", daemon = True).start()
+    return dispatcher
+
+# Background re-scoring of stored applications
+RESCORE_CHUNK_SIZE = 200
+RESCORE_POLL_SECONDS = 60
+
+def get_stale_profiles():
+    """Get the ids of profiles with applications scored against an older profile version"""
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+
+    c.execute('''
+    SELECT DISTINCT user_profile.id FROM user_profile
+    JOIN jobs ON jobs.profile_id = user_profile.id
+    WHERE jobs.score_version IS NULL OR jobs.score_version < user_profile.version
+    ''')
+    results = [row[0] for row in c.fetchall()]
+
+    conn.close()
+    return results
+
+def bump_changed_resumes():
+    """Bump the version of profiles whose resume contents changed since the profile was saved or last checked"""
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+
+    c.execute("SELECT id, resume_path, resume_hash FROM user_profile WHERE resume_path IS NOT NULL AND resume_path != ''")
+    for profile_id, resume_path, resume_hash in c.fetchall():
+        try:
+            resume_data = get_resume_data(resume_path)
+        except (ValueError, OSError):
+            continue
+
+        file_hash = resume_data["file_hash"] if resume_data else None
+        if file_hash != resume_hash:
+            # Only bump if the stored hash is still the one read, so concurrent checks bump once
+            c.execute('UPDATE user_profile SET version = version + 1, resume_hash = ? WHERE id = ? AND resume_hash IS ?',
+                      (file_hash, profile_id, resume_hash))
+            conn.commit()
+
+    conn.close()
+
+def rescore_stale_jobs(profile_id, chunk_size = RESCORE_CHUNK_SIZE, progress = None):
+    """Rescore a profile's stale applications in chunked transactions and return how many were updated
+
+    progress, if given, is called with (rescored, total) after each chunk.
+    """
+    user_profile = get_user_profile(profile_id)
+    if not user_profile:
+        return 0
+
+    version = user_profile["version"]
+
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+
+    c.execute('SELECT COUNT(*) FROM jobs WHERE profile_id = ? AND (score_version IS NULL OR score_version < ?)',
+              (profile_id, version))
+    total = c.fetchone()[0]
+    rescored = 0
+
+    while rescored < total:
+        c.execute('''
+        SELECT id, job_description FROM jobs
+        WHERE profile_id = ? AND (score_version IS NULL OR score_version < ?)
+        LIMIT ?
+        ''', (profile_id, version, chunk_size))
+        chunk = c.fetchall()
+        if not chunk:
+            break
+
+        scores = score_jobs([job_description or "" for _, job_description in chunk], user_profile)
+        c.executemany('UPDATE jobs SET matching_score = ?, score_version = ? WHERE id = ?',
+                      [(score, version, job_id) for (job_id, _), score in zip(chunk, scores)])
+
+        # Commit per chunk so readers and writers on other threads are never blocked for long
+        conn.commit()
+        rescored += len(chunk)
+        if progress:
+            progress(rescored, total)
+
+    conn.close()
+    return rescored
+
+class RescoreWorker:
+    """Background thread that brings stored scores up to date for profiles queued with request()"""
+
+    def __init__(self, chunk_size = RESCORE_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.progress = {}
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target = self._run, name = "rescore-worker", daemon = True)
+
+    def start(self):
+        # Pick up anything left stale by a previous process
+        self.request_stale()
+        self._thread.start()
+
+    def request(self, profile_id):
+        self.progress[profile_id] = (0, None)
+        self._queue.put(profile_id)
+
+    def request_stale(self):
+        """Queue every stale profile not already queued, including versions bumped by other processes or resume changes"""
+        try:
+            bump_changed_resumes()
+            stale_profiles = get_stale_profiles()
+        except sqlite3.Error:
+            logger.exception("Could not look up stale profiles")
+            return
+
+        for profile_id in stale_profiles:
+            if profile_id not in self.progress:
+                self.request(profile_id)
+
+    def _run(self):
+        while True:
+            try:
+                profile_id = self._queue.get(timeout = RESCORE_POLL_SECONDS)
+            except queue.Empty:
+                self.request_stale()
+                continue
+
+            try:
+                rescore_stale_jobs(profile_id, self.chunk_size,
+                                   lambda rescored, total: self.progress.__setitem__(profile_id, (rescored, total)))
+                self.progress.pop(profile_id, None)
+            except sqlite3.OperationalError:
+                # Most likely a locked database; try again shortly
+                time.sleep(1)
+                self._queue.put(profile_id)
+            except Exception:
+                # Keep the worker alive for other profiles; this one is picked up again on its next request
+                logger.exception("Rescoring profile %s failed", profile_id)
+                self.progress.pop(profile_id, None)
+
+@st.cache_resource
+def get_rescore_worker():
+    """Get the process-wide re-scoring worker, starting it on first use"""
+    worker = RescoreWorker()
+    worker.start()
+    return worker
+
+# Search results are kept per session without descriptions; those live in a cache shared by all sessions
+RESULT_COLUMNS = ["job_title", "company", "location", "salary", "job_url", "platform", "date_posted", "matching_score",
+                  "job_type", "salary_min", "salary_max", "location_code"]
+DESCRIPTION_CACHE_SIZE = 2000
+DESCRIPTION_RETENTION_DAYS = 7
+
+class DescriptionCache:
+    """Bounded LRU cache of job descriptions keyed by job URL"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, job_url, description):
+        with self._lock:
+            self._items[job_url] = description
+            self._items.move_to_end(job_url)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last = False)
+
+    def get(self, job_url):
+        with self._lock:
+            description = self._items.get(job_url)
+            if description is not None:
+                self._items.move_to_end(job_url)
+            return description
+
+    def memory_usage(self):
+        with self._lock:
+            return sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in self._items.items())
+
+    def __len__(self):
+        return len(self._items)
+
+@st.cache_resource
+def get_description_cache():
+    """Get the description cache shared across all sessions"""
+    return DescriptionCache(DESCRIPTION_CACHE_SIZE)
+
+def compact_job_results(jobs):
+    """Move descriptions into the shared cache and return results as a compact DataFrame"""
+    cache = get_description_cache()
+    for job in jobs:
+        cache.put(job["job_url"], job["job_description"])
+
+    # Keep a copy on disk too, so descriptions evicted from memory by other sessions' searches can be recovered
+    now = datetime.now()
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+    c.executemany('INSERT OR REPLACE INTO job_descriptions (job_url, job_description, cached_at) VALUES (?, ?, ?)',
+                  [(job["job_url"], job["job_description"], now.isoformat(timespec = "seconds")) for job in jobs])
+    c.execute('DELETE FROM job_descriptions WHERE cached_at < ?',
+              ((now - pd.Timedelta(days = DESCRIPTION_RETENTION_DAYS)).isoformat(timespec = "seconds"),))
+    conn.commit()
+    conn.close()
+
+    return pd.DataFrame(jobs, columns = RESULT_COLUMNS)
+
+def get_job_description(profile_id, job_url):
+    """Look up a job description, falling back to stored search results and the user's applied jobs
+
+    Returns None when the description is no longer available anywhere.
+    """
+    cache = get_description_cache()
+    description = cache.get(job_url)
+    if description is not None:
+        return description
+
+    conn = sqlite3.connect('job_applications.db')
+    c = conn.cursor()
+    c.execute('SELECT job_description FROM job_descriptions WHERE job_url = ?', (job_url,))
+    result = c.fetchone()
+    if not result:
+        c.execute('SELECT job_description FROM jobs WHERE profile_id = ? AND job_url = ? LIMIT 1', (profile_id, job_url))
+        result = c.fetchone()
+    conn.close()
+
+    if not result or result[0] is None:
+        return None
+
+    cache.put(job_url, result[0])
+    return result[0]
+
+def clear_result_state():
+    """Remove per-result toggles left over from previous searches"""
+    for key in [key for key in st.session_state.keys() if key.startswith("show_details_")]:
+        del st.session_state[key]
+
+def session_memory_usage():
+    """Estimate the bytes held by this session's state"""
+    total = 0
+    for value in st.session_state.values():
+        if isinstance(value, pd.DataFrame):
+            total += value.memory_usage(index = True, deep = True).sum()
+        else:
+            total += sys.getsizeof(value)
+
+    return int(total)
+
+# Session-scoped profile selection; a None profile_id means a new profile is being set up
+profiles = list_user_profiles()
+profile_names = {profile["id"]: profile["full_name"] or f"Profile #{profile['id']}" for profile in profiles}
+profile_options = list(profile_names) + [None]
+
+if "profile_id" not in st.session_state or st.session_state.profile_id not in profile_options:
+    st.session_state.profile_id = profile_options[0]
+
+st.session_state.profile_id = st.sidebar.selectbox(
+    "Profile",
+    profile_options,
+    index = profile_options.index(st.session_state.profile_id),
+    format_func = lambda profile_id: profile_names.get(profile_id, "➕ New Profile")
+)
+profile_id = st.session_state.profile_id
+settings = load_settings(profile_id)
+start_notification_dispatcher()
+rescore_worker = get_rescore_worker()
+
 if page == "Dashboard":
     st.markdown("<h1 class = 'main-header'>Job Application Agent Dashboard</h1>", unsafe_allow_html = True)
 
@@ -363,34 +1302,21 @@ if page == "Dashboard":
         st.markdown("<div class = 'card'>", unsafe_allow_html = True)
         st.markdown("h3>Quick Stats</h3>", unsafe_allow_html = True)
 
-        applied_jobs = get_applied_jobs()
-        total_applications = len(applied_jobs)
+        statuses = get_status_counts(profile_id)
+        total_applications = sum(statuses.values())
 
-        statuses = {}
-        platforms = {}
-        recent_activity = []
-
-        for job in applied_jobs:
-            status = job["status"]
-            platform = job["platform"]
-
-            if status in statuses:
-                statuses[status] += 1
-            else:
-                statuses[status] = 1
-
-            if platform in platforms:
-                platforms[platform] += 1
-            else:
-                platforms[platform] = 1
-
-            date_applied = datetime.strptime(job["date_applied"], "%Y-%m-%d").date()
-            days_ago = (datetime.now().date() - date_applied).days
-            if days_ago <= 7:
-                recent_activity.append(job)
+        # Only the last week is needed for the activity views, fetched through the (profile_id, date_applied) index
+        week_start = (datetime.now().date() - pd.Timedelta(days = 7)).strftime("%Y-%m-%d")
+        recent_activity = get_applied_jobs(profile_id, since = week_start)
 
         st.metric("Total Applications", total_applications)
 
+        # Scores are updated in the background after a profile change; show progress rather than wait for it
+        rescore_progress = rescore_worker.progress.get(profile_id)
+        if rescore_progress:
+            rescored, total = rescore_progress
+            st.caption(f"Updating match scores for your new profile: {rescored}/{total if total is not None else '...'}")
+
         status_cols = st.columns(4)
         with status_cols[0]:
             applied_count = statuses.get("Applied", 0)
@@ -408,7 +1334,7 @@ if page == "Dashboard":
             rejected_count = statuses.get("Rejected", 0)
             st.metric("Rejected", rejected_count)
 
-        if applied_jobs:
+        if recent_activity:
             st.markdown("<h4>Weekly Applications Activity</h4>", unsafe_allow_html = True)
 
             today = datetime.now().date()
@@ -416,7 +1342,7 @@ if page == "Dashboard":
 
             daily_counts = {date: 0 for date in date_range}
 
-            for job in applied_jobs:
+            for job in recent_activity:
                 if job["date_applied"] in daily_counts:
                     daily_counts[job["date_applied"]] += 1
 
@@ -440,7 +1366,7 @@ if page == "Dashboard":
                 <div style = "margin-bottom: 15px; padding-bottom: 10px; border-bottom: 1px soldi #eee;">
                     <strong>{job['job_title']}</strong> at {job['company']}
                     <br>
-                    <span class = "{status_class}">{job['status']}</span • {job['date_applied']} • {job['platform']}
+                    <span class = "{status_class}">{job['status']}</span • {job['date_applied']} • {job['platform']} • Match {job['matching_score']}%
                 </div>
                 """, unsafe_allow_html = True)
         else:
@@ -451,7 +1377,7 @@ if page == "Dashboard":
         st.markdown("<div class = 'card'>", unsafe_allow_html = True)
         st.markdown("h3>Profile Summary</h3>", unsafe_allow_html = True)
 
-        user_profile = get_user_profile()
+        user_profile = get_user_profile(profile_id)
         if user_profile:
             st.markdown(f"""
             <p><strong>Name:</strong> {user_profile['full_name']}</p>
@@ -508,7 +1434,7 @@ if page == "Dashboard":
 elif page == "Job Search":
     st.markdown("<h1 class = 'main-header'>Job Search & Auto-Apply</h1>", unsafe_allow_html = True)
 
-    user_profile = get_user_profile()
+    user_profile = get_user_profile(profile_id)
     if not user_profile:
         st.warning("Please set up your profile before searching for jobs")
         if st.button("Go to Profile Setup"):
@@ -523,81 +1449,110 @@ elif page == "Job Search":
 
         with st.form("job_search_form"):
             default_keywords = ", ".join(user_profile["skills"].split(",")[:3])
-            keywords = st.text_input("Keywords (skills, job titles)", values = default_keywords)
+            keywords = st.text_input("Keywords (skills, job titles)", value = default_keywords)
 
             default_location = ""
-            if user_profile["preferences"]:
-                location_match = re.search(r'location[:\s]+([\w\s,]+)', user_profile["preferences"], re.IGNORECASE)
+            if user_profile["preference"]:
+                location_match = re.search(r'location[:\s]+([\w\s,]+)', user_profile["preference"], re.IGNORECASE)
                 if location_match:
-                    default_keywords = location_match.group(1).strip()
+                    default_location = location_match.group(1).strip()
 
-                location = st.text_input("Location", value = default_location)
+            location = st.text_input("Location", value = default_location)
 
-                platforms = st.multiselect(
-                    "Job Platforms",
-                    ["LinkedIn", "Indedd", "Glassdoor", "Welcome to the Jungle", "Handshake", "Built In", "Google Jobs", "ZipRecruiter", "Monster"],
-                    default = ["LinkedIn", "Indeed", "Glassdoor", "Google Jobs"]
-                )
+            platforms = st.multiselect(
+                "Job Platforms",
+                JOB_PLATFORMS,
+                default = settings.preferred_platforms
+            )
 
-                num_results = st.slider("Maximum Results", min_value = 10, max_value = 100, value = 20, step = 10)
+            num_results = st.slider("Maximum Results", min_value = 10, max_value = 100, value = 20, step = 10)
 
-                search_button = st.form_submit_button("Search Jobs")
+            search_button = st.form_submit_button("Search Jobs")
 
-            # Auto-apply settings
-            st.markdown("<h3> Auto-Apply Settings</h3>", unsafe_allow_html=True)
-            
-            min_match_score = st.slider("Minimum Match Score (%)", 0, 100, 70)
+        # Auto-apply settings
+        st.markdown("<h3> Auto-Apply Settings</h3>", unsafe_allow_html=True)
+        
+        min_match_score = st.slider("Minimum Match Score (%)", 0, 100, settings.min_match_score)
 
+        auto_apply_all = False
+        if settings.enable_auto_apply:
             auto_apply_all = st.checkbox("Apply to All Matching Jobs Automatically", value=False)
+        else:
+            st.info("Auto-apply is disabled in Application Settings")
 
-            if auto_apply_all:
-                max_daily_applications = st.number_input("Maximum Daily Applications", min_value=1, max_value=50, value=10)
+        if auto_apply_all:
+            max_daily_applications = st.number_input("Maximum Daily Applications", min_value=1, max_value=50, value=settings.max_applications)
 
-            st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
     with col2:
         st.markdown("<div class='card'>", unsafe_allow_html=True)
         st.markdown("<h3>Search Results</h3>", unsafe_allow_html=True)
 
         if "job_results" not in st.session_state:
-            st.session_state.job_results = []
+            st.session_state.job_results = pd.DataFrame(columns = RESULT_COLUMNS)
+
+        message_template = settings.message_template
 
         if search_button:
             with st.spinner("Searching for jobs across platforms..."):
-                time.sleep(2)
+                time.sleep(2 * SIMULATED_DELAY_SCALE)
 
                 jobs = scrape_jobs(keywords, location, platforms, num_results)
 
-                for job in jobs:
-                    job["matching_score"] = calculate_matching_score(
-                        job["job_description"],
-                        user_profile["skills"],
-                        user_profile["experience"]
-                    )
+                # Only jobs that pass the preference filters are scored and rendered
+                jobs, filter_stages = filter_jobs(jobs, settings, location)
+
+                for job, score in zip(jobs, score_jobs([job["job_description"] for job in jobs], user_profile)):
+                    job["matching_score"] = score
 
                 jobs.sort(key=lambda x: x["matching_score"], reverse=True)
 
-                st.session_state.job_results = jobs
+                clear_result_state()
+                st.session_state.job_results = compact_job_results(jobs)
+                st.session_state.job_results_version = user_profile["version"]
                 st.success(f"Found {len(jobs)} matching jobs!")
 
                 if auto_apply_all:
                     matching_jobs = [job for job in jobs if job["matching_score"] >= min_match_score]
                     jobs_to_apply = matching_jobs[:max_daily_applications] if auto_apply_all else[]
+                    filter_stages += [("Match score", len(matching_jobs)), ("Daily limit", len(jobs_to_apply))]
 
                     if jobs_to_apply:
                         applied_count = 0
+                        messages = render_messages(message_template, jobs_to_apply, user_profile)
                         with st.spinner(f"Auto-applying to {len(jobs_to_apply)} jobs..."):
-                            for job in jobs_to_apply:
-                                success = apply_to_job(job, user_profile)
+                            for job, message in zip(jobs_to_apply, messages):
+                                success = apply_to_job(job, user_profile, message)
                                 if success:
                                     applied_count += 1
 
-                                time.sleep(0.5)
+                                time.sleep(0.5 * SIMULATED_DELAY_SCALE)
 
                         st.success(f"Successfully applied to {applied_count} jobs!")
 
-        if st.session_state.job_results:
-            for i, job in enumerate(st.session_state.job_results):
+                st.caption("Jobs remaining after each stage: " + " → ".join(f"{stage} {count}" for stage, count in filter_stages))
+
+        # Results scored against an older profile version are rescored from the shared description cache;
+        # results whose description is no longer available are dropped rather than scored against nothing
+        if not st.session_state.job_results.empty and st.session_state.get("job_results_version") != user_profile["version"]:
+            job_results = st.session_state.job_results
+            descriptions = [get_job_description(profile_id, job_url) for job_url in job_results["job_url"]]
+            available = [description is not None for description in descriptions]
+
+            job_results = job_results[available].copy()
+            job_results["matching_score"] = score_jobs([description for description in descriptions if description is not None], user_profile)
+            st.session_state.job_results = job_results.sort_values("matching_score", ascending = False, ignore_index = True)
+            st.session_state.job_results_version = user_profile["version"]
+
+            # Per-result toggles are keyed by position, which the re-sort changes
+            clear_result_state()
+
+            if not all(available):
+                st.info(f"{available.count(False)} results could not be rescored for your updated profile and were removed. Search again to see them.")
+
+        if not st.session_state.job_results.empty:
+            for i, job in enumerate(st.session_state.job_results.to_dict("records")):
                 if job["matching_score"] >= 80:
                     score_class = "match-score-high"
                 elif job["matching_score"] >= 60:
@@ -620,30 +1575,37 @@ elif page == "Job Search":
                         st.session_state[f"show_details_{i}"] = not st.session_state.get(f"show_details_{i}", False)
 
                 with col2:
-                    conn = sqlite3.connect("job_application.db")
-                    c = conn.cursor()
-                    c.execute('SELECT COUNT(*) FROM jobs WHERE job_url = ?', (job["job_url"],))
-                    already_applied = c.fetchone()[0] > 0
-                    conn.close()
+                    already_applied = has_applied(profile_id, job["job_url"])
 
                     if already_applied:
                         st.button("Already Applied", key=f"applied_{i}", disabled=True)
                     else:
                         if st.button(f"Apply Now #{i}", key=f"apply_{i}"):
-                            with st.spinner("Applying to job..."):
-                                time.sleep(2)
-                                success = apply_to_job(job, user_profile)
-
-                                if success:
-                                    st.success("Successfully applied!")
-                                else:
-                                    st.error("Application failed. Please try again or apply manually.")
+                            job["job_description"] = get_job_description(profile_id, job["job_url"])
+                            if job["job_description"] is None:
+                                st.error("This job's description is no longer available. Please search again before applying.")
+                            else:
+                                with st.spinner("Applying to job..."):
+                                    time.sleep(2 * SIMULATED_DELAY_SCALE)
+                                    message = render_messages(message_template, [job], user_profile)[0]
+                                    success = apply_to_job(job, user_profile, message)
+
+                                    if success:
+                                        st.success("Successfully applied!")
+                                        with st.expander("Application Message"):
+                                            st.text(message)
+                                    else:
+                                        st.error("Application failed. Please try again or apply manually.")
 
                 if st.session_state.get(f"show_details_{i}", False):
+                    job_description = get_job_description(profile_id, job["job_url"])
+                    if job_description is None:
+                        job_description = "This job's description is no longer available. Please search again to see it."
+
                     st.markdown(f"""
                     <div style="background-color: #f9f9f9; padding: 15px; border-radius: 5px; margin-top: 10px;">
                         <h5>Job Description</h5>
-                        <p>{job["job_description"]}</p>
+                        <p>{job_description}</p>
                         <p><strong>URL:</strong> <a href="{job["job_url"]} target="_blank">{job["job_url"]}</a></p>
                         <p><strong>Date Posted:</strong> {job["date_posted"]}</p>
                     </div>
@@ -656,7 +1618,7 @@ elif page == "Job Search":
 elif page == "Profile Setup":
     st.markdown("<h1 class='main-header'>Profile Setup</h1>", unsafe_allow_html=True)
 
-    existing_profile = get_user_profile()
+    existing_profile = get_user_profile(profile_id)
 
     with st.form("profile_setup_form"):
         st.markdown("<h3>Personal Information</h3>", unsafe_allow_html=True)
@@ -691,7 +1653,7 @@ elif page == "Profile Setup":
         st.markdown("<h3>Job Preferences</h3>", unsafe_allow_html=True)
 
         preferences = st.text_area("Job Preferences",
-                        value=existing_profile["preferences"] if existing_profile else "",
+                        value=existing_profile["preference"] if existing_profile else "",
                         height=100,
                         help="Enter your job preferences such as: location, remote/hybrid/in-office, salary range, etc.")
         
@@ -709,11 +1671,49 @@ elif page == "Profile Setup":
             "preferences": preferences
         }
 
-        save_user_profile(profile_data)
+        # Auto-fill any fields left blank from the parsed resume
+        try:
+            resume_data = get_resume_data(resume_path)
+        except (ValueError, OSError) as e:
+            resume_data = None
+            st.warning(f"Could not parse resume: {e}")
+
+        if resume_data:
+            profile_data["resume_hash"] = resume_data["file_hash"]
+            if not skills.strip():
+                profile_data["skills"] = ", ".join(resume_data["skills"])
+            if not experience.strip() and resume_data["years_experience"]:
+                profile_data["experience"] = f"{resume_data['years_experience']} years of professional experience"
+            if not education.strip():
+                profile_data["education"] = resume_data["education"]
+
+        st.session_state.profile_id = save_user_profile(profile_data, profile_id)
+        rescore_worker.request(st.session_state.profile_id)
         st.success("Profile saved successfully!")
 
+    if existing_profile and existing_profile["resume_path"]:
+        try:
+            resume_data = get_resume_data(existing_profile["resume_path"])
+        except (ValueError, OSError):
+            resume_data = None
+
+        if resume_data:
+            st.markdown("<h3>Parsed Resume</h3>", unsafe_allow_html=True)
+            st.markdown(f"""
+            <p><strong>Skills:</strong> {', '.join(resume_data['skills']) or 'None found'}</p>
+            <p><strong>Years of Experience:</strong> {resume_data['years_experience']}</p>
+            <p><strong>Education:</strong> {resume_data['education'] or 'None found'}</p>
+            """, unsafe_allow_html=True)
+            st.caption(f"Parsed once in {resume_data['parse_seconds'] * 1000:.1f} ms; cached until the file changes")
+        else:
+            st.info("Resume file could not be read")
+
 elif page == "Application Settings":
     st.markdown("<h1 class='main-header'>Application Settings</h1>", unsafe_allow_html=True)
+
+    if not profile_id:
+        st.warning("Please set up your profile before changing application settings")
+        st.stop()
     
     col1, col2 = st.columns(2)
     
@@ -722,27 +1722,31 @@ elif page == "Application Settings":
         st.markdown("<h3>Auto-Apply Settings</h3>", unsafe_allow_html=True)
 
         with st.form("auto_apply_settings"):
-            st.checkbox("Enable Auto-Apply Feature", value=True, key="enable_auto_apply")
+            enable_auto_apply = st.checkbox("Enable Auto-Apply Feature", value=settings.enable_auto_apply)
             
-            st.number_input("Maximum Application Per Day", min_value=1, max_value=50, value=10, key="max_applications")
+            max_applications = st.number_input("Maximum Application Per Day", min_value=1, max_value=50, value=settings.max_applications)
 
-            st.slider("Minimum Match Score for Auto-Apply (%)", min_value=0, max_value=100, value=75, key="min_match_score")
+            min_match_score = st.slider("Minimum Match Score for Auto-Apply (%)", min_value=0, max_value=100, value=settings.min_match_score)
 
-            st.multiselect(
+            preferred_platforms = st.multiselect(
                 "Preferred Job Platforms",
-                ["LinkedIn", "Indeed", "Glassdoor", "Welcome to the Jungle", "Handshake", "Built In", "Google Jobs", "ZipRecruiter",
-                 "Monster"],
-                 default=["LinkedIn", "Indeed", "Glassdoor"],
-                 key="preferred_platforms"
+                JOB_PLATFORMS,
+                 default=settings.preferred_platforms
             )
 
-            st.text_area("Auto-Apply Message Template",
-                         value="Dear Hiring Manager, \n\nI am writing to express my interest in the [JOB_TITLE] position at [COMPANY]. With my experience in [SKILLS], I believe I would be a great fit for this role. \n\nThank you for your consideration. \n\nBest regards, \n[FULL_NAME]",
+            message_template = st.text_area("Auto-Apply Message Template",
+                         value=settings.message_template,
                          height=150,
-                         help="Customize the message template for auto-applications. Use [JOB_TITLE], [COMPANY], [SKILLS, [FULL_NAME] as placeholders.",
-                         key="message_template")
+                         help="Customize the message template for auto-applications. Use [JOB_TITLE], [COMPANY], [SKILLS], [FULL_NAME] as placeholders.")
             
-            st.form_submit_button("Save Auto-Apply Settings")
+            if st.form_submit_button("Save Auto-Apply Settings"):
+                settings = save_settings(profile_id,
+                                         enable_auto_apply=enable_auto_apply,
+                                         max_applications=max_applications,
+                                         min_match_score=min_match_score,
+                                         preferred_platforms=preferred_platforms,
+                                         message_template=message_template)
+                st.success("Auto-apply settings saved!")
 
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -750,32 +1754,37 @@ elif page == "Application Settings":
         st.markdown("<h3>Job Filter Settings</h3>", unsafe_allow_html=True)
 
         with st.form("job_filter_settings"):
-            st.multiselect(
+            job_types = st.multiselect(
                 "Job Types",
-                ["Full-time", "Part-time", "Contract", "Temporary", "Internship", "Remote"],
-                default=["Full-time", "Remote"],
-                key="job_types"
+                JOB_TYPES,
+                default=settings.job_types
             )
 
-            col1, col2 = st.columns(2)
+            salary_col1, salary_col2 = st.columns(2)
 
-            with col1:
-                st.number_input("Minimum Salary ($K)", min_value=0, max_value=500, value=50, key="min_salary")
+            with salary_col1:
+                min_salary = st.number_input("Minimum Salary ($K)", min_value=0, max_value=500, value=settings.min_salary)
 
-            with col2:
-                st.number_input("Maximum Salary ($K)", min_value=0, max_value=500, value=200, key="max_salary")
+            with salary_col2:
+                max_salary = st.number_input("Maximum Salary ($K)", min_value=0, max_value=500, value=settings.max_salary)
 
-            st.multiselect(
+            industries = st.multiselect(
                 "Industry Preferences",
                 ["Technology", "Healthcare", "Finance", "Education", "Retail", "Manufacturing", "Media", "Consulting", "Non-profit",
                  "Government"],
-                 default=["Technology", "Finance", "Consulting"],
-                 key="industries"
+                 default=settings.industries
             )
 
-            st.text_input("Location Preferences", value="Remote, New York, San Francisco, Boston", key="locations")
+            locations = st.text_input("Location Preferences", value=settings.locations)
 
-            st.form_submit_button("Save Job Filter Settings")
+            if st.form_submit_button("Save Job Filter Settings"):
+                settings = save_settings(profile_id,
+                                         job_types=job_types,
+                                         min_salary=min_salary,
+                                         max_salary=max_salary,
+                                         industries=industries,
+                                         locations=locations)
+                st.success("Job filter settings saved!")
 
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -784,27 +1793,31 @@ elif page == "Application Settings":
         st.markdown("<h3>Notfication Settings</h3>", unsafe_allow_html=True)
 
         with st.form("notification_settings"):
-            st.checkbox("Email Notifications", value=True, key="email_notifications")
+            email_notifications = st.checkbox("Email Notifications", value=settings.email_notifications)
 
-            st.text_input("Notification Email", value="", key="notification_email",
+            notification_email = st.text_input("Notification Email", value=settings.notification_email,
                           help="Email address to receive job application notifications")
             
-            st.multiselect(
+            notification_types = st.multiselect(
                 "Notify Me About",
                 ["New matching jobs", "Successful applications", "Application status changes",
                  "Interview invitations", "Job offers", "Daily Summary"],
-                 default=["Successful applications", "Interview invitations", "Job offers"],
-                 key="notification_types"
+                 default=settings.notification_types
             )
 
-            st.select_slider(
+            notification_frequency = st.select_slider(
                 "Notification Frequency",
                 options=["Immediately", "Hourly", "Daily", "Weekly"],
-                value="Daily"
-                key="notification_frequency"
+                value=settings.notification_frequency
             )
 
-            st.form_submit_button("Save Notification Settings")
+            if st.form_submit_button("Save Notification Settings"):
+                settings = save_settings(profile_id,
+                                         email_notifications=email_notifications,
+                                         notification_email=notification_email,
+                                         notification_types=notification_types,
+                                         notification_frequency=notification_frequency)
+                st.success("Notification settings saved!")
     
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -839,6 +1852,13 @@ elif page == "Application Settings":
 
         with st.expander("LinkedIn API"):
             st.text_input("LinkedIn API Key", type="password")
+
+# Per-session memory report
+description_cache = get_description_cache()
+st.sidebar.caption(
+    f"Session state: {session_memory_usage() / 1024:.1f} KB • "
+    f"Shared description cache: {len(description_cache)} jobs ({description_cache.memory_usage() / 1024:.1f} KB)"
+)
             
     
 
@@ -0,0 +1,191 @@
+"""Benchmarks for the Job Application Agent helpers
+
+Usage:
+    python benchmarks.py resume [resume files...]
+    python benchmarks.py templates [number of renders]
+    python benchmarks.py notifications [number of events] [number of profiles]   (requires aiosmtpd)
+
+The app is imported in Streamlit's bare mode from a scratch directory, so benchmarks
+never touch your own job_applications.db.
+"""
+import os
+import sys
+import socket
+import tempfile
+import time
+import statistics
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CALLER_DIR = os.getcwd()
+WORK_DIR = tempfile.mkdtemp(prefix = "job_agent_bench_")
+
+sys.path.insert(0, APP_DIR)
+os.chdir(WORK_DIR)
+
+import Automated_Job_Application as app
+
+def make_sample_resumes(sizes = (1, 10, 100)):
+    """Write synthetic TXT (and DOCX when python-docx is installed) resumes of increasing length"""
+    section = """
+    Senior Software Engineer, Acme Corp, 2016 - Present
+    - Built data pipelines in Python, SQL and Airflow on AWS
+    - Deployed services with Docker and Kubernetes, mentored a team of five
+    Data Analyst, Initech, 2012 - 2016
+    - Reporting in Excel, Tableau and PowerBI; statistics and machine learning prototypes
+    """
+    education = "Bachelor of Science in Computer Science, State University\nMaster of Science in Statistics\n"
+
+    paths = []
+    for size in sizes:
+        text = section * size + education
+
+        txt_path = os.path.join(WORK_DIR, f"resume_{size}x.txt")
+        with open(txt_path, "w") as f:
+            f.write(text)
+        paths.append(txt_path)
+
+        if app.docx is not None:
+            docx_path = os.path.join(WORK_DIR, f"resume_{size}x.docx")
+            document = app.docx.Document()
+            for line in text.splitlines():
+                document.add_paragraph(line)
+            document.save(docx_path)
+            paths.append(docx_path)
+
+    return paths
+
+def benchmark_resume(paths, repeat = 5):
+    """Time a cold parse of each resume against a cached lookup"""
+    paths = [os.path.join(CALLER_DIR, path) for path in paths] or make_sample_resumes()
+
+    print(f"{'Document':<40} {'Size (KB)':>10} {'Parse (ms)':>12} {'Cached (ms)':>12}")
+    for path in paths:
+        parse_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            app.parse_resume(path)
+            parse_times.append(time.perf_counter() - start)
+
+        # The first lookup parses and stores; the rest are served from resume_cache
+        app.get_resume_data(path)
+        cached_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            app.get_resume_data(path)
+            cached_times.append(time.perf_counter() - start)
+
+        print(f"{os.path.basename(path):<40} {os.path.getsize(path) / 1024:>10.1f} "
+              f"{statistics.median(parse_times) * 1000:>12.2f} {statistics.median(cached_times) * 1000:>12.2f}")
+
+def benchmark_templates(args, count = 10000):
+    """Measure message render throughput for one auto-apply batch against naive per-job replacement"""
+    count = int(args[0]) if args else count
+
+    user_profile = {
+        "full_name": "Jane Doe",
+        "skills": "Python, SQL, AWS, Docker, Machine Learning, Tableau",
+        "experience": "6 years",
+        "resume_path": ""
+    }
+    jobs = [{
+        "job_title": f"Data Engineer {i}",
+        "company": f"Company {i % 50}",
+        "job_description": f"Requirements: 3+ years. Proficiency in: Python, SQL, {'AWS' if i % 2 else 'Docker'}, Spark"
+    } for i in range(count)]
+    template = app.DEFAULT_MESSAGE_TEMPLATE
+    skills, _ = app.get_matching_profile(user_profile)
+    job_skills = [", ".join(app.find_matched_skills(job["job_description"], skills)[:3]) for job in jobs]
+
+    # Substitution alone: a str.replace chain per job against the compiled template
+    start = time.perf_counter()
+    for job, matched_skills in zip(jobs, job_skills):
+        (template.replace("[JOB_TITLE]", job["job_title"]).replace("[COMPANY]", job["company"])
+                 .replace("[SKILLS]", matched_skills).replace("[FULL_NAME]", user_profile["full_name"]))
+    replace_seconds = time.perf_counter() - start
+
+    app.compile_template.cache_clear()
+    start = time.perf_counter()
+    render = app.compile_template(template)
+    for job, matched_skills in zip(jobs, job_skills):
+        render(job["job_title"], job["company"], matched_skills, user_profile["full_name"])
+    compiled_seconds = time.perf_counter() - start
+
+    # End to end, including picking each job's skills from the matcher's hits
+    start = time.perf_counter()
+    messages = app.render_messages(template, jobs, user_profile)
+    batch_seconds = time.perf_counter() - start
+
+    assert len(messages) == count
+    print(f"{'Renderer':<34} {'Renders':>10} {'Total (ms)':>12} {'Renders/sec':>14}")
+    for name, seconds in [("str.replace per job", replace_seconds), ("compiled template", compiled_seconds),
+                          ("render_messages (with skills)", batch_seconds)]:
+        print(f"{name:<34} {count:>10} {seconds * 1000:>12.1f} {count / seconds:>14.0f}")
+
+def benchmark_notifications(args, count = 10000, profiles = 100):
+    """Measure outbox enqueue rate and digest dispatch rate against a local aiosmtpd server"""
+    count = int(args[0]) if args else count
+    profiles = int(args[1]) if len(args) > 1 else profiles
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        print("aiosmtpd is required: pip install aiosmtpd")
+        sys.exit(1)
+
+    class CountingHandler:
+        def __init__(self):
+            self.messages = 0
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages += 1
+            return "250 OK"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname = "127.0.0.1", port = port)
+    controller.start()
+    # Events are only queued when an SMTP server is configured
+    os.environ["SMTP_HOST"] = "127.0.0.1"
+
+    for profile_id in range(1, profiles + 1):
+        app.save_settings(profile_id, notification_frequency = "Immediately",
+                          notification_email = f"user{profile_id}@example.com",
+                          notification_types = ["Successful applications"])
+
+    # One transaction per event, as apply_to_job commits each application with its event
+    conn = app.sqlite3.connect("job_applications.db")
+    c = conn.cursor()
+    start = time.perf_counter()
+    for i in range(count):
+        app.enqueue_notification(c, i % profiles + 1, "Successful applications", f"Applied to job {i}")
+        conn.commit()
+    enqueue_seconds = time.perf_counter() - start
+    conn.close()
+
+    dispatcher = app.NotificationDispatcher("127.0.0.1", port)
+    start = time.perf_counter()
+    digests = dispatcher.dispatch()
+    dispatch_seconds = time.perf_counter() - start
+    dispatcher.close()
+    controller.stop()
+
+    assert digests == handler.messages == profiles
+    print(f"{'Stage':<12} {'Events':>10} {'Emails':>8} {'Total (ms)':>12} {'Events/sec':>12}")
+    print(f"{'Enqueue':<12} {count:>10} {'-':>8} {enqueue_seconds * 1000:>12.1f} {count / enqueue_seconds:>12.0f}")
+    print(f"{'Dispatch':<12} {count:>10} {digests:>8} {dispatch_seconds * 1000:>12.1f} {count / dispatch_seconds:>12.0f}")
+
+BENCHMARKS = {
+    "resume": benchmark_resume,
+    "templates": benchmark_templates,
+    "notifications": benchmark_notifications
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(__doc__)
+        sys.exit(1)
+
+    BENCHMARKS[sys.argv[1]](sys.argv[2:])
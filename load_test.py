@@ -0,0 +1,215 @@
+"""Multi-session load test for the Job Application Agent
+
+Simulates concurrent users clicking through Dashboard, Job Search (search with auto-apply,
+then Apply Now) and back to the Dashboard, using Streamlit's AppTest driver against a seeded
+SQLite database in a scratch directory. Reports rerun latency percentiles per step, database
+lock errors and memory per session (session state size and peak RSS growth after the first run).
+
+AppTest installs a process-global Streamlit runtime for each run, so concurrent sessions cannot
+share one process. Each session runs in its own process instead; all of them hit the same
+database file, which is where the contention is, but in-process caches are not shared.
+
+Usage:
+    python load_test.py [--sessions 10] [--iterations 3] [--seed-jobs 200] [--simulate-delays]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Automated_Job_Application.py")
+
+def seed_database(sessions, seed_jobs):
+    """Create one profile per session with permissive settings and a history of applications"""
+    # A first run creates the schema. AppTest leaves the app installed as __main__, which would
+    # stop the session processes from finding run_session, so put this module back afterwards
+    main_module = sys.modules["__main__"]
+    AppTest.from_file(APP_PATH, default_timeout = 60).run()
+    sys.modules["__main__"] = main_module
+
+    conn = sqlite3.connect("job_applications.db")
+    c = conn.cursor()
+
+    statuses = ["Applied", "Applied", "Applied", "Interview", "Offer", "Rejected"]
+    today = datetime.now().date()
+    profile_ids = []
+
+    for i in range(sessions):
+        c.execute('''
+        INSERT INTO user_profile (full_name, email, phone, resume_path, skills, experience, education, preference, version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+        ''', (f"Load Test User {i}", f"user{i}@example.com", "", "", "Python, SQL, AWS, Docker, React",
+              f"{random.randint(1, 10)} years", "B.Sc. Computer Science", ""))
+        profile_id = c.lastrowid
+        profile_ids.append(profile_id)
+
+        # Open filters so every search exercises scoring, rendering and auto-apply
+        c.execute('INSERT INTO settings (profile_id, data) VALUES (?, ?)', (profile_id, json.dumps({
+            "min_match_score": 0, "locations": "", "job_types": [], "min_salary": 0, "max_salary": 500
+        })))
+
+        c.executemany('''
+        INSERT INTO jobs (job_title, company, location, job_description, salary, job_url, platform,
+                          date_applied, status, matching_score, notes, profile_id, score_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+        ''', [(
+            "Software Engineer", f"Company {j % 40}", "CA", "Requirements: 3+ years. Proficiency in: Python, SQL",
+            "$120K - $150K", f"https://example.com/jobs/{profile_id}-{j}", "LinkedIn",
+            (today - timedelta(days = random.randint(0, 30))).strftime("%Y-%m-%d"),
+            random.choice(statuses), random.uniform(40, 95), "Seeded by load test", profile_id
+        ) for j in range(seed_jobs)])
+
+    conn.commit()
+    conn.close()
+    return profile_ids
+
+class SessionResult:
+    """Latencies, errors and memory collected by one simulated session"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.lock_errors = 0
+        self.other_errors = []
+        self.session_state_kb = None
+        self.rss_growth_kb = 0
+
+    def record(self, step, at, action):
+        start = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            # Timeouts and driver errors are counted the same way as script exceptions
+            if "database is locked" in str(e):
+                self.lock_errors += 1
+            else:
+                self.other_errors.append(f"{step}: {e}")
+            return
+        self.latencies.setdefault(step, []).append(time.perf_counter() - start)
+
+        for exception in at.exception:
+            if "database is locked" in exception.message:
+                self.lock_errors += 1
+            else:
+                self.other_errors.append(f"{step}: {exception.message}")
+
+        for caption in at.sidebar.caption:
+            match = re.search(r'Session state: ([\d.]+) KB', caption.value)
+            if match:
+                self.session_state_kb = float(match.group(1))
+
+def run_session(profile_id, iterations, work_dir, start_barrier, results):
+    """Click through the app as one user, in its own process, and put the SessionResult on the results queue"""
+    os.chdir(work_dir)
+    result = SessionResult()
+
+    # Every session starts clicking at the same moment, after its process has finished importing
+    start_barrier.wait()
+
+    at = AppTest.from_file(APP_PATH, default_timeout = 120)
+    result.record("initial load", at, at.run)
+
+    # The first run imports pandas, selenium and the Streamlit runtime; measure growth from after it
+    rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result.record("select profile", at, lambda: at.sidebar.selectbox[0].set_value(profile_id).run())
+
+    for _ in range(iterations):
+        result.record("dashboard", at, lambda: at.sidebar.radio[0].set_value("Dashboard").run())
+        result.record("job search page", at, lambda: at.sidebar.radio[0].set_value("Job Search").run())
+
+        auto_apply = [checkbox for checkbox in at.checkbox if checkbox.label.startswith("Apply to All")]
+        if auto_apply:
+            auto_apply[0].check()
+        search = [button for button in at.button if button.label == "Search Jobs"]
+        if search:
+            result.record("search + auto-apply", at, lambda: search[0].click().run())
+
+        apply_now = [button for button in at.button if button.label.startswith("Apply Now")]
+        if apply_now:
+            result.record("apply now", at, lambda: apply_now[0].click().run())
+
+    result.rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before_kb
+    results.put(result)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def report(results, elapsed):
+    """Print latency percentiles per step, error counts and memory per session"""
+    steps = {}
+    for result in results:
+        for step, latencies in result.latencies.items():
+            steps.setdefault(step, []).extend(latencies)
+    all_latencies = [latency for latencies in steps.values() for latency in latencies]
+
+    print(f"\n{'Step':<22} {'Reruns':>8} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}")
+    for step, latencies in list(steps.items()) + [("all reruns", all_latencies)]:
+        if latencies:
+            print(f"{step:<22} {len(latencies):>8} " + " ".join(
+                f"{percentile(latencies, fraction) * 1000:>10.1f}" for fraction in (0.5, 0.95, 0.99, 1.0)
+            ))
+
+    lock_errors = sum(result.lock_errors for result in results)
+    other_errors = [error for result in results for error in result.other_errors]
+    session_sizes = [result.session_state_kb for result in results if result.session_state_kb is not None]
+
+    print(f"\nSessions: {len(results)}  Wall time: {elapsed:.1f}s  Reruns/sec: {len(all_latencies) / elapsed:.1f}")
+    print(f"'database is locked' errors: {lock_errors}  Other errors: {len(other_errors)}")
+    for error in other_errors[:5]:
+        print(f"  {error}")
+    if session_sizes:
+        print(f"Session state per session: mean {sum(session_sizes) / len(session_sizes):.1f} KB, max {max(session_sizes):.1f} KB")
+    rss_growth = [result.rss_growth_kb for result in results]
+    print(f"Peak RSS growth per session after initial load: mean {sum(rss_growth) / len(rss_growth) / 1024:.1f} MB, "
+          f"max {max(rss_growth) / 1024:.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description = "Multi-session load test for the Job Application Agent")
+    parser.add_argument("--sessions", type = int, default = 10, help = "Number of concurrent sessions")
+    parser.add_argument("--iterations", type = int, default = 3, help = "Dashboard/search/apply rounds per session")
+    parser.add_argument("--seed-jobs", type = int, default = 200, help = "Stored applications seeded per profile")
+    parser.add_argument("--simulate-delays", action = "store_true", help = "Keep the app's simulated scraping delays")
+    args = parser.parse_args()
+
+    if not args.simulate_delays:
+        os.environ["SIMULATED_DELAY_SCALE"] = "0"
+
+    # Each run gets its own database so results are comparable and your data is untouched
+    os.chdir(tempfile.mkdtemp(prefix = "job_agent_load_"))
+    print(f"Seeding {args.sessions} profiles with {args.seed_jobs} applications each in {os.getcwd()}")
+    profile_ids = seed_database(args.sessions, args.seed_jobs)
+
+    context = multiprocessing.get_context("spawn")
+    # The main process joins the barrier too, so timing starts when every session is ready
+    start_barrier = context.Barrier(len(profile_ids) + 1)
+    result_queue = context.Queue()
+    processes = [
+        context.Process(target = run_session, args = (profile_id, args.iterations, os.getcwd(), start_barrier, result_queue),
+                        name = f"session-{profile_id}")
+        for profile_id in profile_ids
+    ]
+    for process in processes:
+        process.start()
+
+    start_barrier.wait()
+    start = time.perf_counter()
+    results = [result_queue.get() for _ in processes]
+    elapsed = time.perf_counter() - start
+
+    for process in processes:
+        process.join()
+
+    report(results, elapsed)
+
+if __name__ == "__main__":
+    sys.exit(main())